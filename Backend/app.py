@@ -1,11 +1,9 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
-import random
-from datetime import datetime, timedelta
-import numpy as np
+from datetime import datetime
 from io import StringIO
-import re
+
+from timetable import TimetableGenerator
 
 # Page configuration
 st.set_page_config(
@@ -55,296 +53,18 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-class TimetableGenerator:
-    def __init__(self):
-        self.teachers = {}
-        self.subjects = {}
-        self.classes = {}
-        self.teacher_subject_map = {}
-        self.time_slots = []
-        self.working_days = []
-        self.timetable = {}
-        
-    def parse_sql_file(self, sql_content):
-        """Parse SQL file and extract data"""
-        try:
-            # Create in-memory database
-            conn = sqlite3.connect(':memory:')
-            cursor = conn.cursor()
-            
-            # Execute SQL commands
-            sql_commands = sql_content.split(';')
-            for command in sql_commands:
-                command = command.strip()
-                if command and not command.lower().startswith('select'):
-                    try:
-                        cursor.execute(command)
-                    except Exception as e:
-                        if "already exists" not in str(e).lower():
-                            st.warning(f"SQL Warning: {e}")
-            
-            conn.commit()
-            
-            # Extract data from tables
-            self.extract_data_from_db(conn)
-            conn.close()
-            return True
-            
-        except Exception as e:
-            st.error(f"Error parsing SQL file: {e}")
-            return False
-    
-    def extract_data_from_db(self, conn):
-        """Extract data from database tables"""
-        cursor = conn.cursor()
-        
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
-        for table in tables:
-            table_name = table[0]
-            
-            if 'teacher' in table_name.lower():
-                self.extract_teachers(cursor, table_name)
-            elif 'subject' in table_name.lower():
-                self.extract_subjects(cursor, table_name)
-            elif 'class' in table_name.lower():
-                self.extract_classes(cursor, table_name)
-    
-    def extract_teachers(self, cursor, table_name):
-        """Extract teacher data"""
-        try:
-            cursor.execute(f"SELECT * FROM {table_name}")
-            columns = [description[0] for description in cursor.description]
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                teacher_data = dict(zip(columns, row))
-                teacher_id = teacher_data.get('Teacher_ID') or teacher_data.get('teacher_id')
-                if teacher_id:
-                    self.teachers[teacher_id] = {
-                        'name': teacher_data.get('Teacher_Name') or teacher_data.get('name', f'Teacher {teacher_id}'),
-                        'max_lectures_per_week': teacher_data.get('Max_Lectures_Per_Week') or teacher_data.get('max_lectures', 20),
-                        'preferred_slots': teacher_data.get('Preferred_Slots') or teacher_data.get('preferred_slots', 'Any')
-                    }
-        except Exception as e:
-            st.warning(f"Could not extract teachers from {table_name}: {e}")
-    
-    def extract_subjects(self, cursor, table_name):
-        """Extract subject data"""
-        try:
-            cursor.execute(f"SELECT * FROM {table_name}")
-            columns = [description[0] for description in cursor.description]
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                subject_data = dict(zip(columns, row))
-                subject_id = subject_data.get('Subject_ID') or subject_data.get('subject_id')
-                if subject_id:
-                    self.subjects[subject_id] = {
-                        'name': subject_data.get('Subject_Name') or subject_data.get('name', f'Subject {subject_id}'),
-                        'is_common': subject_data.get('Is_Common') or subject_data.get('is_common', False),
-                        'weekly_lectures': subject_data.get('Weekly_Lectures') or subject_data.get('lectures', 3)
-                    }
-        except Exception as e:
-            st.warning(f"Could not extract subjects from {table_name}: {e}")
-    
-    def extract_classes(self, cursor, table_name):
-        """Extract class data"""
-        try:
-            cursor.execute(f"SELECT * FROM {table_name}")
-            columns = [description[0] for description in cursor.description]
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                class_data = dict(zip(columns, row))
-                class_id = class_data.get('Class_ID') or class_data.get('class_id')
-                if class_id:
-                    self.classes[class_id] = {
-                        'name': class_data.get('Class_Name') or class_data.get('name', class_id),
-                        'subjects': []
-                    }
-        except Exception as e:
-            st.warning(f"Could not extract classes from {table_name}: {e}")
-    
-    def setup_default_data(self):
-        """Setup default data for demonstration"""
-        # Default teachers
-        self.teachers = {
-            'T1': {'name': 'Prof. A', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
-            'T2': {'name': 'Prof. B', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
-            'T3': {'name': 'Prof. C', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
-            'T4': {'name': 'Prof. D', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
-            'T5': {'name': 'Prof. E', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
-            'T6': {'name': 'Prof. F', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
-        }
-        
-        # Default subjects
-        self.subjects = {
-            'S1': {'name': 'Accounting', 'is_common': True, 'weekly_lectures': 4},
-            'S2': {'name': 'DBMS', 'is_common': False, 'weekly_lectures': 4},
-            'S3': {'name': 'OS', 'is_common': False, 'weekly_lectures': 4},
-            'S4': {'name': 'Programming', 'is_common': True, 'weekly_lectures': 4},
-            'S5': {'name': 'Web Tech', 'is_common': False, 'weekly_lectures': 4},
-            'S6': {'name': 'Software Eng', 'is_common': False, 'weekly_lectures': 4},
-        }
-        
-        # Default classes
-        self.classes = {
-            'FYCS': {'name': 'First Year CS', 'subjects': ['S1', 'S4']},
-            'SYCS': {'name': 'Second Year CS', 'subjects': ['S2', 'S6']},
-            'TYCS': {'name': 'Third Year CS', 'subjects': ['S3', 'S5']},
-        }
-        
-        # Default teacher-subject mapping
-        self.teacher_subject_map = {
-            ('T1', 'FYCS', 'S1'): True,
-            ('T1', 'FYCS', 'S4'): True,
-            ('T2', 'SYCS', 'S2'): True,
-            ('T2', 'SYCS', 'S6'): True,
-            ('T3', 'TYCS', 'S3'): True,
-            ('T3', 'TYCS', 'S5'): True,
-        }
-    
-    def generate_time_slots(self, start_time="09:00", end_time="17:00", lecture_duration=60, break_times=None):
-        """Generate time slots for the day"""
-        if break_times is None:
-            break_times = [("11:00", "11:15", "Short Break"), ("13:00", "14:00", "Lunch Break")]
-        
-        self.time_slots = []
-        current_time = datetime.strptime(start_time, "%H:%M")
-        end_dt = datetime.strptime(end_time, "%H:%M")
-        
-        slot_num = 1
-        while current_time < end_dt:
-            slot_end = current_time + timedelta(minutes=lecture_duration)
-            
-            # Check for breaks
-            is_break = False
-            for break_start, break_end, break_name in break_times:
-                break_start_dt = datetime.strptime(break_start, "%H:%M")
-                break_end_dt = datetime.strptime(break_end, "%H:%M")
-                
-                if current_time <= break_start_dt < slot_end:
-                    # Add break slot
-                    self.time_slots.append({
-                        'slot': f'Break-{len(self.time_slots)+1}',
-                        'start_time': break_start,
-                        'end_time': break_end,
-                        'type': 'break',
-                        'name': break_name
-                    })
-                    current_time = break_end_dt
-                    is_break = True
-                    break
-            
-            if not is_break and current_time < end_dt:
-                self.time_slots.append({
-                    'slot': f'P{slot_num}',
-                    'start_time': current_time.strftime("%H:%M"),
-                    'end_time': slot_end.strftime("%H:%M"),
-                    'type': 'lecture'
-                })
-                current_time = slot_end
-                slot_num += 1
-    
-    def generate_timetable(self, working_days=None):
-        """Generate the complete timetable"""
-        if working_days is None:
-            working_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        
-        self.working_days = working_days
-        
-        # Initialize timetable structure
-        for class_id in self.classes:
-            self.timetable[class_id] = {}
-            for day in working_days:
-                self.timetable[class_id][day] = {}
-                for slot in self.time_slots:
-                    if slot['type'] == 'lecture':
-                        self.timetable[class_id][day][slot['slot']] = {
-                            'subject': None,
-                            'teacher': None,
-                            'time': f"{slot['start_time']}-{slot['end_time']}"
-                        }
-                    else:
-                        self.timetable[class_id][day][slot['slot']] = {
-                            'subject': slot['name'],
-                            'teacher': 'Break',
-                            'time': f"{slot['start_time']}-{slot['end_time']}"
-                        }
-        
-        # Schedule lectures using constraint satisfaction
-        self.schedule_lectures()
-    
-    def schedule_lectures(self):
-        """Schedule lectures using a simple greedy algorithm with constraints"""
-        # Create subject-teacher assignments
-        assignments = []
-        for (teacher_id, class_id, subject_id), can_teach in self.teacher_subject_map.items():
-            if can_teach and subject_id in self.subjects:
-                lectures_needed = self.subjects[subject_id]['weekly_lectures']
-                for _ in range(lectures_needed):
-                    assignments.append({
-                        'teacher': teacher_id,
-                        'class': class_id,
-                        'subject': subject_id,
-                        'subject_name': self.subjects[subject_id]['name']
-                    })
-        
-        # Track teacher and class schedules
-        teacher_schedule = {tid: {day: [] for day in self.working_days} for tid in self.teachers}
-        class_schedule = {cid: {day: [] for day in self.working_days} for cid in self.classes}
-        
-        # Shuffle assignments for randomization
-        random.shuffle(assignments)
-        
-        # Schedule each assignment
-        scheduled = []
-        for assignment in assignments:
-            teacher_id = assignment['teacher']
-            class_id = assignment['class']
-            subject_id = assignment['subject']
-            
-            # Find available slot
-            slot_found = False
-            for day in self.working_days:
-                if slot_found:
-                    break
-                for slot_data in self.time_slots:
-                    if slot_data['type'] != 'lecture':
-                        continue
-                    
-                    slot = slot_data['slot']
-                    
-                    # Check if slot is available for both teacher and class
-                    if (slot not in teacher_schedule[teacher_id][day] and 
-                        slot not in class_schedule[class_id][day] and
-                        self.timetable[class_id][day][slot]['subject'] is None):
-                        
-                        # Assign the slot
-                        self.timetable[class_id][day][slot] = {
-                            'subject': assignment['subject_name'],
-                            'teacher': self.teachers[teacher_id]['name'],
-                            'time': f"{slot_data['start_time']}-{slot_data['end_time']}"
-                        }
-                        
-                        # Update schedules
-                        teacher_schedule[teacher_id][day].append(slot)
-                        class_schedule[class_id][day].append(slot)
-                        scheduled.append(assignment)
-                        slot_found = True
-                        break
-        
-        # Report unscheduled assignments
-        unscheduled = len(assignments) - len(scheduled)
-        if unscheduled > 0:
-            st.warning(f"⚠️ {unscheduled} lectures could not be scheduled due to constraints")
+class StreamlitLogger:
+    """Shows generator messages in the Streamlit page"""
+
+    def warning(self, message):
+        st.warning(message)
+
+    def error(self, message):
+        st.error(message)
 
 # Initialize session state
 if 'generator' not in st.session_state:
-    st.session_state.generator = TimetableGenerator()
+    st.session_state.generator = TimetableGenerator(logger=StreamlitLogger())
 
 # Sidebar for configuration
 with st.sidebar:
@@ -392,6 +112,8 @@ with st.sidebar:
                 working_days.append(day)
     
     # Generate timetable button
+    force = st.checkbox("Generate even if the check fails", value=False,
+                        help="Schedule what fits and leave the rest unscheduled")
     if st.button("🎯 Generate Timetable", type="primary"):
         if not st.session_state.generator.teachers:
             st.error("❌ No teacher data found! Please upload SQL file or use default data.")
@@ -402,8 +124,40 @@ with st.sidebar:
                     end_time.strftime("%H:%M"),
                     lecture_duration
                 )
-                st.session_state.generator.generate_timetable(working_days)
-                st.success("✅ Timetable generated successfully!")
+                report = st.session_state.generator.check_feasibility(working_days)
+                if not report['feasible']:
+                    message = (f"Timetable cannot be completed: {report['summary']} "
+                               f"(checked in {report['elapsed_ms']:.1f} ms)")
+                    if force:
+                        st.warning(f"⚠️ {message}")
+                    else:
+                        st.error(f"❌ {message}")
+                    for t in report['overcommitted_teachers']:
+                        if t['constraint'] == 'max_lectures_per_week':
+                            st.write(f"👨‍🏫 {t['name']} ({t['teacher']}): {t['demand']} lectures, "
+                                     f"weekly limit {t['max_lectures_per_week']}")
+                        else:
+                            st.write(f"👨‍🏫 {t['name']} ({t['teacher']}): {t['demand']} lectures, "
+                                     f"only {t['available_slots']} available slots")
+                    for c in report['overcommitted_classes']:
+                        if c['constraint'] == 'slots_per_week':
+                            st.write(f"🏫 {c['name']} ({c['class']}): {c['demand']} lectures, "
+                                     f"{c['available_slots']} periods in the week")
+                        else:
+                            st.write(f"🏫 {c['name']} ({c['class']}): {c['demand']} lectures, "
+                                     f"only {c['available_slots']} fit its teachers' availability")
+                    for teacher_id, class_id, subject_id in report['unknown_mappings']:
+                        st.write(f"❓ Mapping {teacher_id} / {class_id} / {subject_id} references an unknown teacher or class")
+
+                if report['feasible'] or force:
+                    st.session_state.generator.generate_timetable(working_days)
+                    if report['feasible']:
+                        st.success("✅ Timetable generated successfully!")
+                    else:
+                        st.success("✅ Partial timetable generated")
+                else:
+                    # Don't leave an earlier timetable on screen next to the new slot layout
+                    st.session_state.generator.timetable = {}
 
 # Main content area
 col1, col2 = st.columns([2, 1])
@@ -0,0 +1 @@
+# Lets the tests import the timetable package from this directory
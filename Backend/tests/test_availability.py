@@ -0,0 +1,115 @@
+import pytest
+
+from timetable import TimetableGenerator
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+
+@pytest.fixture
+def generator():
+    generator = TimetableGenerator()
+    # P1 09:00, P2 10:00, P3 11:15, P4 14:00, P5 15:00, P6 16:00
+    generator.generate_time_slots()
+    return generator
+
+
+def parse(generator, expression):
+    lecture_slots = [slot for slot in generator.time_slots if slot['type'] == 'lecture']
+    return generator.parse_availability(expression, lecture_slots, DAYS)
+
+
+def grid(mask, periods=6):
+    """Render a mask as one string per day, e.g. 'XXX...'"""
+    return [''.join('X' if mask >> (d * periods + p) & 1 else '.' for p in range(periods)) for d in range(len(DAYS))]
+
+
+def test_any_allows_everything(generator):
+    hard, soft, problems = parse(generator, 'Any')
+    assert grid(hard) == ['XXXXXX'] * 5
+    assert soft == hard
+    assert problems == []
+
+
+def test_day_and_period_ranges(generator):
+    hard, _, problems = parse(generator, 'Mon-Wed P1-P4')
+    assert grid(hard) == ['XXXX..'] * 3 + ['......'] * 2
+    assert problems == []
+
+
+@pytest.mark.parametrize('expression', ['Monday to Wednesday', 'mon - wed', 'Mondays-Wednesdays'])
+def test_spelled_out_day_ranges(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['XXXXXX'] * 3 + ['......'] * 2
+    assert problems == []
+
+
+@pytest.mark.parametrize('expression', ['Tues-Thurs', 'Tuesday to Thu'])
+def test_abbreviated_day_names(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['......'] + ['XXXXXX'] * 3 + ['......']
+    assert problems == []
+
+
+@pytest.mark.parametrize('expression', ['Morning', 'Mornings', 'P1 to P3'])
+def test_morning_periods(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['XXX...'] * 5
+    assert problems == []
+
+
+def test_blocked_day(generator):
+    hard, _, _ = parse(generator, 'Not Fri')
+    assert grid(hard) == ['XXXXXX'] * 4 + ['......']
+
+
+def test_preference_is_soft(generator):
+    hard, soft, _ = parse(generator, 'Prefer Afternoon, Not Mon')
+    assert grid(hard) == ['......'] + ['XXXXXX'] * 4
+    assert grid(soft) == ['......'] + ['...XXX'] * 4
+
+
+@pytest.mark.parametrize('expression', ['Unavailable', 'No'])
+def test_bare_block_keyword_is_ignored(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['XXXXXX'] * 5
+    assert len(problems) == 1
+
+
+@pytest.mark.parametrize('expression', ['Evening', 'Sat'])
+def test_selector_outside_the_week_is_reported(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert hard == 0
+    assert problems == [f"'{expression.lower()}' matches nothing in this week"]
+
+
+@pytest.mark.parametrize('expression', ['No preference', ''])
+def test_no_restriction(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['XXXXXX'] * 5
+    assert problems == []
+
+
+@pytest.mark.parametrize('expression', ['Mon after lunch', 'Fri-Mon', 'Monthly', 'Sunny afternoons'])
+def test_unrecognised_clause_is_ignored(generator, expression):
+    hard, _, problems = parse(generator, expression)
+    assert grid(hard) == ['XXXXXX'] * 5
+    assert len(problems) == 1 and problems[0].startswith('ignored')
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+    def error(self, message):
+        self.warnings.append(message)
+
+
+def test_empty_hard_mask_warns(generator):
+    generator.logger = RecordingLogger()
+    generator.teachers = {'T1': {'name': 'Prof. A', 'max_lectures_per_week': 20, 'preferred_slots': 'Sat'}}
+    generator.build_availability(DAYS)
+    assert generator.availability['T1'][0] == 0
+    assert 'no available slots left' in generator.logger.warnings[0]
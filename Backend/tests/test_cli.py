@@ -0,0 +1,60 @@
+import csv
+import json
+import os
+import shutil
+
+import pytest
+
+from timetable import cli
+
+RAW_CSV = os.path.join(os.path.dirname(__file__), '..', '..', 'Raw', 'CSV')
+
+
+@pytest.fixture
+def data_set(tmp_path):
+    folder = tmp_path / 'college'
+    shutil.copytree(RAW_CSV, folder / 'CSV')
+    return folder
+
+
+def class_ids():
+    with open(os.path.join(RAW_CSV, 'Classes Table.csv'), newline='', encoding='utf-8') as f:
+        return sorted(row['Class_ID'] for row in csv.DictReader(f))
+
+
+def test_writes_class_timetables_and_summary(data_set, tmp_path):
+    out = tmp_path / 'out'
+    assert cli.main([str(data_set), '--out', str(out), '--jobs', '1', '--seed', '1', '--force']) == 0
+
+    written = sorted(os.listdir(out / 'college'))
+    assert written == sorted([f"{class_id}.csv" for class_id in class_ids()] + ['summary.json'])
+
+    summary = json.loads((out / 'college' / 'summary.json').read_text())
+    assert summary['generated'] is True
+    assert summary['unscheduled'] >= 0
+
+    with open(out / 'college' / written[0], newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == 'Day'
+    assert [row[0] for row in rows[1:]] == cli.DEFAULT_DAYS.split(',')
+
+
+def test_infeasible_run_removes_stale_class_files(data_set, tmp_path):
+    out = tmp_path / 'out'
+    cli.main([str(data_set), '--out', str(out), '--jobs', '1', '--seed', '1', '--force'])
+
+    # The sample data fails the pre-check, so without --force nothing is generated
+    assert cli.main([str(data_set), '--out', str(out), '--jobs', '1']) == 1
+    assert os.listdir(out / 'college') == ['summary.json']
+    summary = json.loads((out / 'college' / 'summary.json').read_text())
+    assert summary['generated'] is False
+    assert summary['feasibility']['feasible'] is False
+
+
+def test_find_data_folders_lists_each_folder_once(data_set, tmp_path):
+    folders = cli.find_data_folders([str(data_set), str(tmp_path), str(data_set) + os.sep])
+    assert folders == [str(data_set)]
+
+
+def test_no_data_sets(tmp_path):
+    assert cli.main([str(tmp_path), '--out', str(tmp_path / 'out')]) == 2
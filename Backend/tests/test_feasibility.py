@@ -0,0 +1,138 @@
+import pytest
+
+from timetable import TimetableGenerator
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+
+@pytest.fixture
+def generator():
+    generator = TimetableGenerator()
+    # Six lecture periods a day: P1 09:00, P2 10:00, P3 11:15, P4 14:00, P5 15:00, P6 16:00
+    generator.generate_time_slots()
+    return generator
+
+
+def two_teacher_class(generator, first_slots, second_slots):
+    generator.teachers = {
+        'T1': {'name': 'Prof. A', 'max_lectures_per_week': 20, 'preferred_slots': first_slots},
+        'T2': {'name': 'Prof. B', 'max_lectures_per_week': 20, 'preferred_slots': second_slots},
+    }
+    generator.subjects = {
+        'S1': {'name': 'Accounting', 'is_common': True, 'weekly_lectures': 1},
+        'S2': {'name': 'DBMS', 'is_common': False, 'weekly_lectures': 1},
+    }
+    generator.classes = {'FYCS': {'name': 'First Year CS', 'subjects': ['S1', 'S2']}}
+    generator.teacher_subject_map = {('T1', 'FYCS', 'S1'): True, ('T2', 'FYCS', 'S2'): True}
+
+
+def test_clash_within_class_is_infeasible(generator):
+    two_teacher_class(generator, 'Mon P1', 'Mon P1')
+    report = generator.check_feasibility(DAYS)
+    assert not report['feasible']
+    assert report['overcommitted_classes'] == [{
+        'class': 'FYCS', 'name': 'First Year CS', 'demand': 2, 'available_slots': 1,
+        'constraint': 'teacher_availability'
+    }]
+    assert report['summary'] == "1 class(es) whose teachers' available slots cannot fit all lectures"
+
+
+def test_distinct_slots_are_feasible_and_scheduled(generator):
+    two_teacher_class(generator, 'Mon P1', 'Mon P2')
+    assert generator.check_feasibility(DAYS)['feasible']
+    generator.generate_timetable(DAYS)
+    assert generator.unscheduled == 0
+    assert generator.timetable['FYCS']['Monday']['P1']['teacher'] == 'Prof. A'
+    assert generator.timetable['FYCS']['Monday']['P2']['teacher'] == 'Prof. B'
+
+
+def test_max_slot_matching_reroutes_earlier_choices(generator):
+    # The flexible lecture has to give up P1 for the one that can only use P1
+    assert generator.max_slot_matching([0b11, 0b01]) == 2
+    assert generator.max_slot_matching([0b01, 0b01, 0b10]) == 2
+    assert generator.max_slot_matching([]) == 0
+
+
+def one_class(generator, max_lectures=20, weekly_lectures=4, preferred_slots='Any', subjects=1):
+    generator.teachers = {
+        'T1': {'name': 'Prof. A', 'max_lectures_per_week': max_lectures, 'preferred_slots': preferred_slots},
+    }
+    generator.subjects = {
+        f'S{i}': {'name': f'Subject {i}', 'is_common': False, 'weekly_lectures': weekly_lectures}
+        for i in range(1, subjects + 1)
+    }
+    generator.classes = {'FYCS': {'name': 'First Year CS', 'subjects': list(generator.subjects)}}
+    generator.teacher_subject_map = {('T1', 'FYCS', subject_id): True for subject_id in generator.subjects}
+
+
+def test_feasible_instance(generator):
+    one_class(generator)
+    report = generator.check_feasibility(DAYS)
+    assert report['feasible']
+    assert report['summary'] == ''
+    assert report['slots_per_week'] == 30
+    assert report['total_lectures'] == 4
+
+
+def test_teacher_over_weekly_limit(generator):
+    one_class(generator, max_lectures=6, subjects=2)
+    report = generator.check_feasibility(DAYS)
+    assert not report['feasible']
+    assert report['overcommitted_teachers'] == [{
+        'teacher': 'T1', 'name': 'Prof. A', 'demand': 8, 'max_lectures_per_week': 6,
+        'available_slots': 30, 'constraint': 'max_lectures_per_week'
+    }]
+    assert report['summary'] == '1 teacher(s) over their weekly lecture limit'
+
+
+def test_teacher_short_of_available_slots(generator):
+    one_class(generator, preferred_slots='Mon', weekly_lectures=8)
+    report = generator.check_feasibility(DAYS)
+    [teacher] = report['overcommitted_teachers']
+    assert teacher['constraint'] == 'available_slots'
+    assert teacher['demand'] == 8
+    assert teacher['available_slots'] == 6
+    # Its class cannot fit the lectures into Monday either
+    assert report['summary'] == (
+        '1 teacher(s) with fewer available slots than lectures; '
+        "1 class(es) whose teachers' available slots cannot fit all lectures"
+    )
+
+
+def test_class_over_slots_per_week(generator):
+    one_class(generator, max_lectures=40, weekly_lectures=8, subjects=4)
+    report = generator.check_feasibility(DAYS)
+    assert report['overcommitted_classes'] == [{
+        'class': 'FYCS', 'name': 'First Year CS', 'demand': 32, 'available_slots': 30,
+        'constraint': 'slots_per_week'
+    }]
+    # The same class is not reported a second time by the matching check
+    assert report['summary'] == (
+        '1 teacher(s) with fewer available slots than lectures; '
+        '1 class(es) with more lectures than periods in the week'
+    )
+
+
+def test_unknown_mappings_are_reported_and_skipped(generator):
+    one_class(generator)
+    generator.teacher_subject_map[('T9', 'FYCS', 'S1')] = True
+    generator.teacher_subject_map[('T1', 'ZZCS', 'S1')] = True
+    report = generator.check_feasibility(DAYS)
+    assert not report['feasible']
+    assert report['unknown_mappings'] == [('T9', 'FYCS', 'S1'), ('T1', 'ZZCS', 'S1')]
+    assert report['summary'] == '2 mapping(s) to an unknown teacher or class'
+
+    # Forcing generation places what it can and counts the rest as unscheduled
+    generator.generate_timetable(DAYS)
+    assert generator.unscheduled == 8
+
+
+def test_solver_respects_weekly_limit(generator):
+    one_class(generator, max_lectures=6, subjects=2)
+    generator.generate_timetable(DAYS)
+    placed = [
+        cell for day in generator.timetable['FYCS'].values() for cell in day.values()
+        if cell['teacher'] == 'Prof. A'
+    ]
+    assert len(placed) == 6
+    assert generator.unscheduled == 2
@@ -0,0 +1,4 @@
+"""Importable timetable engine, usable without Streamlit."""
+from .generator import TimetableGenerator
+
+__all__ = ['TimetableGenerator']
@@ -0,0 +1,180 @@
+"""Batch timetable generation without Streamlit.
+
+The package lives in Backend/, so run it from there or put Backend/ on the path:
+
+    cd Backend && python -m timetable ../Raw --out timetables
+    PYTHONPATH=Backend python -m timetable datasets/ --jobs 4 --days Monday,Tuesday,Wednesday
+
+Each input is a Raw/-style folder (the table CSVs directly or in a CSV/
+subfolder), or a folder of such folders. Every data set is generated in its
+own worker process and written to <out>/<name>/ as one CSV per class plus a
+summary.json with the feasibility report and any warnings.
+"""
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .generator import CSV_TABLES, TimetableGenerator
+
+DEFAULT_DAYS = 'Monday,Tuesday,Wednesday,Thursday,Friday'
+
+
+class MessageLog:
+    """Logger stand-in that keeps messages so they can go into the summary"""
+
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, message):
+        self.messages.append({'level': 'warning', 'message': message})
+
+    def error(self, message):
+        self.messages.append({'level': 'error', 'message': message})
+
+
+def is_data_folder(folder):
+    teachers = CSV_TABLES['teachers']
+    return (os.path.exists(os.path.join(folder, teachers))
+            or os.path.exists(os.path.join(folder, 'CSV', teachers)))
+
+
+def find_data_folders(inputs):
+    """Expand the command line inputs into data set folders, each listed once"""
+    folders = []
+    seen = set()
+    for path in inputs:
+        if is_data_folder(path):
+            candidates = [path]
+        elif os.path.isdir(path):
+            candidates = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if is_data_folder(os.path.join(path, name))]
+        else:
+            candidates = []
+        for folder in candidates:
+            real = os.path.realpath(folder)
+            if real not in seen:
+                seen.add(real)
+                folders.append(folder)
+    return folders
+
+
+def write_timetable(generator, out_dir):
+    """Write one CSV per class laid out like the Streamlit table"""
+    headers = ['Day'] + [f"{slot['slot']} {slot['start_time']}-{slot['end_time']}" for slot in generator.time_slots]
+    for class_id, days in generator.timetable.items():
+        with open(os.path.join(out_dir, f"{class_id}.csv"), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            for day in generator.working_days:
+                row = [day]
+                for slot in generator.time_slots:
+                    cell = days[day].get(slot['slot'], {})
+                    if not cell.get('subject'):
+                        row.append('Free')
+                    elif cell['teacher'] == 'Break':
+                        row.append(cell['subject'])
+                    else:
+                        row.append(f"{cell['subject']} ({cell['teacher']})")
+                writer.writerow(row)
+
+
+def generate_one(folder, out_dir, options):
+    """Generate and write the timetable for a single data set. Runs in a worker process."""
+    started = time.perf_counter()
+    if options['seed'] is not None:
+        random.seed(options['seed'])
+
+    log = MessageLog()
+    generator = TimetableGenerator(logger=log)
+    generator.load_csv_folder(folder)
+    generator.generate_time_slots(options['start'], options['end'], options['duration'])
+
+    report = generator.check_feasibility(options['days'])
+    generated = report['feasible'] or options['force']
+    os.makedirs(out_dir, exist_ok=True)
+    # Class files from an earlier run would otherwise sit next to this run's summary
+    for stale in glob.glob(os.path.join(out_dir, '*.csv')):
+        os.remove(stale)
+    if generated:
+        generator.generate_timetable(options['days'])
+        write_timetable(generator, out_dir)
+
+    summary = {
+        'input': folder,
+        'generated': generated,
+        'unscheduled': generator.unscheduled if generated else None,
+        'feasibility': report,
+        'messages': log.messages,
+        'elapsed_ms': (time.perf_counter() - started) * 1000
+    }
+    with open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m timetable', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="Raw/-style folders or folders containing them")
+    parser.add_argument('--out', default='timetables', help="output directory (default: %(default)s)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument('--start', default='09:00', help="day start time (default: %(default)s)")
+    parser.add_argument('--end', default='17:00', help="day end time (default: %(default)s)")
+    parser.add_argument('--duration', type=int, default=60, help="lecture duration in minutes (default: %(default)s)")
+    parser.add_argument('--days', default=DEFAULT_DAYS, help="comma separated working days (default: Monday-Friday)")
+    parser.add_argument('--seed', type=int, help="random seed for reproducible timetables")
+    parser.add_argument('--force', action='store_true', help="generate even when the feasibility check fails")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    log = logging.getLogger('timetable')
+
+    folders = find_data_folders(args.inputs)
+    if not folders:
+        log.error("No data sets found in %s", ', '.join(args.inputs))
+        return 2
+
+    options = {
+        'start': args.start,
+        'end': args.end,
+        'duration': args.duration,
+        'days': [day.strip() for day in args.days.split(',') if day.strip()],
+        'seed': args.seed,
+        'force': args.force,
+    }
+
+    # Name each output after its folder, numbering repeats so nothing is overwritten
+    names = {}
+    jobs = []
+    for folder in folders:
+        name = os.path.basename(os.path.normpath(folder))
+        names[name] = names.get(name, 0) + 1
+        if names[name] > 1:
+            name = f"{name}_{names[name]}"
+        jobs.append((folder, os.path.join(args.out, name)))
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as pool:
+        futures = {pool.submit(generate_one, folder, out_dir, options): (folder, out_dir) for folder, out_dir in jobs}
+        for future in as_completed(futures):
+            folder, out_dir = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                log.error("%s: failed: %s", folder, e)
+                continue
+            if not summary['generated']:
+                failures += 1
+                report = summary['feasibility']
+                log.warning("%s: infeasible, %s, see %s", folder, report['summary'], out_dir)
+            else:
+                log.info("%s: %d unscheduled lectures, %.0f ms -> %s",
+                         folder, summary['unscheduled'], summary['elapsed_ms'], out_dir)
+    return 1 if failures else 0
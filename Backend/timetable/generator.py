@@ -0,0 +1,614 @@
+"""Timetable generation engine.
+
+Kept free of Streamlit and other heavy imports so it can be used from the
+UI, scripts and the batch CLI alike. Messages go through ``logger``, which
+is anything with ``warning`` and ``error`` methods.
+"""
+import csv
+import logging
+import os
+import random
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# File names of the tables inside a Raw/-style export folder
+CSV_TABLES = {
+    'teachers': 'Teachers Table.csv',
+    'subjects': 'Subjects Table.csv',
+    'classes': 'Classes Table.csv',
+    'teacher_subject_map': 'Teacher_Subject_Map Table.csv',
+}
+
+
+class TimetableGenerator:
+    def __init__(self, logger=logger):
+        self.logger = logger
+        self.teachers = {}
+        self.subjects = {}
+        self.classes = {}
+        self.teacher_subject_map = {}
+        self.time_slots = []
+        self.working_days = []
+        self.timetable = {}
+        self.unscheduled = 0
+        self.availability = {}
+        self.availability_key = None
+        
+    def parse_sql_file(self, sql_content):
+        """Parse SQL file and extract data"""
+        try:
+            # Create in-memory database
+            conn = sqlite3.connect(':memory:')
+            cursor = conn.cursor()
+            
+            # Execute SQL commands
+            sql_commands = sql_content.split(';')
+            for command in sql_commands:
+                command = command.strip()
+                if command and not command.lower().startswith('select'):
+                    try:
+                        cursor.execute(command)
+                    except Exception as e:
+                        if "already exists" not in str(e).lower():
+                            self.logger.warning(f"SQL Warning: {e}")
+            
+            conn.commit()
+            
+            # Extract data from tables
+            self.extract_data_from_db(conn)
+            conn.close()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error parsing SQL file: {e}")
+            return False
+    
+    def extract_data_from_db(self, conn):
+        """Extract data from database tables"""
+        cursor = conn.cursor()
+        
+        # Get all table names
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        tables = cursor.fetchall()
+        
+        for table in tables:
+            table_name = table[0]
+            
+            if 'teacher' in table_name.lower():
+                self.extract_teachers(cursor, table_name)
+            elif 'subject' in table_name.lower():
+                self.extract_subjects(cursor, table_name)
+            elif 'class' in table_name.lower():
+                self.extract_classes(cursor, table_name)
+    
+    def extract_teachers(self, cursor, table_name):
+        """Extract teacher data"""
+        try:
+            cursor.execute(f"SELECT * FROM {table_name}")
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                teacher_data = dict(zip(columns, row))
+                teacher_id = teacher_data.get('Teacher_ID') or teacher_data.get('teacher_id')
+                if teacher_id:
+                    self.teachers[teacher_id] = {
+                        'name': teacher_data.get('Teacher_Name') or teacher_data.get('name', f'Teacher {teacher_id}'),
+                        'max_lectures_per_week': teacher_data.get('Max_Lectures_Per_Week') or teacher_data.get('max_lectures', 20),
+                        'preferred_slots': teacher_data.get('Preferred_Slots') or teacher_data.get('preferred_slots', 'Any')
+                    }
+        except Exception as e:
+            self.logger.warning(f"Could not extract teachers from {table_name}: {e}")
+    
+    def extract_subjects(self, cursor, table_name):
+        """Extract subject data"""
+        try:
+            cursor.execute(f"SELECT * FROM {table_name}")
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                subject_data = dict(zip(columns, row))
+                subject_id = subject_data.get('Subject_ID') or subject_data.get('subject_id')
+                if subject_id:
+                    self.subjects[subject_id] = {
+                        'name': subject_data.get('Subject_Name') or subject_data.get('name', f'Subject {subject_id}'),
+                        'is_common': subject_data.get('Is_Common') or subject_data.get('is_common', False),
+                        'weekly_lectures': subject_data.get('Weekly_Lectures') or subject_data.get('lectures', 3)
+                    }
+        except Exception as e:
+            self.logger.warning(f"Could not extract subjects from {table_name}: {e}")
+    
+    def extract_classes(self, cursor, table_name):
+        """Extract class data"""
+        try:
+            cursor.execute(f"SELECT * FROM {table_name}")
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                class_data = dict(zip(columns, row))
+                class_id = class_data.get('Class_ID') or class_data.get('class_id')
+                if class_id:
+                    self.classes[class_id] = {
+                        'name': class_data.get('Class_Name') or class_data.get('name', class_id),
+                        'subjects': []
+                    }
+        except Exception as e:
+            self.logger.warning(f"Could not extract classes from {table_name}: {e}")
+    
+    def load_csv_folder(self, folder):
+        """Load teachers, subjects, classes and the teacher-subject map from a Raw/-style folder"""
+        if os.path.isdir(os.path.join(folder, 'CSV')):
+            folder = os.path.join(folder, 'CSV')
+
+        def read(table):
+            path = os.path.join(folder, CSV_TABLES[table])
+            if not os.path.exists(path):
+                self.logger.warning(f"Missing {CSV_TABLES[table]} in {folder}")
+                return []
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                return list(csv.DictReader(f))
+
+        for row in read('teachers'):
+            self.teachers[row['Teacher_ID']] = {
+                'name': row.get('Teacher_Name') or f"Teacher {row['Teacher_ID']}",
+                'max_lectures_per_week': int(row.get('Max_Lectures_Per_Week') or 20),
+                'preferred_slots': row.get('Preferred_Slots') or 'Any'
+            }
+        for row in read('subjects'):
+            self.subjects[row['Subject_ID']] = {
+                'name': row.get('Subject_Name') or f"Subject {row['Subject_ID']}",
+                'is_common': (row.get('Is_Common') or '').strip().lower() in ('yes', 'true', '1'),
+                'weekly_lectures': int(row.get('Weekly_Lectures') or 3)
+            }
+        for row in read('classes'):
+            self.classes[row['Class_ID']] = {
+                'name': row.get('Class_Name') or row['Class_ID'],
+                'subjects': []
+            }
+        for row in read('teacher_subject_map'):
+            self.teacher_subject_map[(row['Teacher_ID'], row['Class_ID'], row['Subject_ID'])] = True
+            if row['Class_ID'] in self.classes:
+                self.classes[row['Class_ID']]['subjects'].append(row['Subject_ID'])
+        return bool(self.teachers)
+    
+    def setup_default_data(self):
+        """Setup default data for demonstration"""
+        # Default teachers
+        self.teachers = {
+            'T1': {'name': 'Prof. A', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
+            'T2': {'name': 'Prof. B', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
+            'T3': {'name': 'Prof. C', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
+            'T4': {'name': 'Prof. D', 'max_lectures_per_week': 18, 'preferred_slots': 'Any'},
+            'T5': {'name': 'Prof. E', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
+            'T6': {'name': 'Prof. F', 'max_lectures_per_week': 20, 'preferred_slots': 'Any'},
+        }
+        
+        # Default subjects
+        self.subjects = {
+            'S1': {'name': 'Accounting', 'is_common': True, 'weekly_lectures': 4},
+            'S2': {'name': 'DBMS', 'is_common': False, 'weekly_lectures': 4},
+            'S3': {'name': 'OS', 'is_common': False, 'weekly_lectures': 4},
+            'S4': {'name': 'Programming', 'is_common': True, 'weekly_lectures': 4},
+            'S5': {'name': 'Web Tech', 'is_common': False, 'weekly_lectures': 4},
+            'S6': {'name': 'Software Eng', 'is_common': False, 'weekly_lectures': 4},
+        }
+        
+        # Default classes
+        self.classes = {
+            'FYCS': {'name': 'First Year CS', 'subjects': ['S1', 'S4']},
+            'SYCS': {'name': 'Second Year CS', 'subjects': ['S2', 'S6']},
+            'TYCS': {'name': 'Third Year CS', 'subjects': ['S3', 'S5']},
+        }
+        
+        # Default teacher-subject mapping
+        self.teacher_subject_map = {
+            ('T1', 'FYCS', 'S1'): True,
+            ('T1', 'FYCS', 'S4'): True,
+            ('T2', 'SYCS', 'S2'): True,
+            ('T2', 'SYCS', 'S6'): True,
+            ('T3', 'TYCS', 'S3'): True,
+            ('T3', 'TYCS', 'S5'): True,
+        }
+    
+    def generate_time_slots(self, start_time="09:00", end_time="17:00", lecture_duration=60, break_times=None):
+        """Generate time slots for the day"""
+        if break_times is None:
+            break_times = [("11:00", "11:15", "Short Break"), ("13:00", "14:00", "Lunch Break")]
+        
+        self.time_slots = []
+        current_time = datetime.strptime(start_time, "%H:%M")
+        end_dt = datetime.strptime(end_time, "%H:%M")
+        
+        slot_num = 1
+        while current_time < end_dt:
+            slot_end = current_time + timedelta(minutes=lecture_duration)
+            
+            # Check for breaks
+            is_break = False
+            for break_start, break_end, break_name in break_times:
+                break_start_dt = datetime.strptime(break_start, "%H:%M")
+                break_end_dt = datetime.strptime(break_end, "%H:%M")
+                
+                if current_time <= break_start_dt < slot_end:
+                    # Add break slot
+                    self.time_slots.append({
+                        'slot': f'Break-{len(self.time_slots)+1}',
+                        'start_time': break_start,
+                        'end_time': break_end,
+                        'type': 'break',
+                        'name': break_name
+                    })
+                    current_time = break_end_dt
+                    is_break = True
+                    break
+            
+            if not is_break and current_time < end_dt:
+                self.time_slots.append({
+                    'slot': f'P{slot_num}',
+                    'start_time': current_time.strftime("%H:%M"),
+                    'end_time': slot_end.strftime("%H:%M"),
+                    'type': 'lecture'
+                })
+                current_time = slot_end
+                slot_num += 1
+    
+    def generate_timetable(self, working_days=None):
+        """Generate the complete timetable"""
+        if working_days is None:
+            working_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        
+        self.working_days = working_days
+        self.timetable = {}
+        
+        # Initialize timetable structure
+        for class_id in self.classes:
+            self.timetable[class_id] = {}
+            for day in working_days:
+                self.timetable[class_id][day] = {}
+                for slot in self.time_slots:
+                    if slot['type'] == 'lecture':
+                        self.timetable[class_id][day][slot['slot']] = {
+                            'subject': None,
+                            'teacher': None,
+                            'time': f"{slot['start_time']}-{slot['end_time']}"
+                        }
+                    else:
+                        self.timetable[class_id][day][slot['slot']] = {
+                            'subject': slot['name'],
+                            'teacher': 'Break',
+                            'time': f"{slot['start_time']}-{slot['end_time']}"
+                        }
+        
+        # Schedule lectures using constraint satisfaction
+        self.schedule_lectures()
+
+    def check_feasibility(self, working_days=None):
+        """Check lecture demand against capacity before running the scheduler"""
+        import numpy as np
+
+        started = time.perf_counter()
+        if working_days is None:
+            working_days = self.working_days or ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+        lecture_slots = sum(1 for slot in self.time_slots if slot['type'] == 'lecture')
+        slots_per_week = lecture_slots * len(working_days)
+
+        teacher_ids = list(self.teachers)
+        class_ids = list(self.classes)
+        teacher_index = {tid: i for i, tid in enumerate(teacher_ids)}
+        class_index = {cid: i for i, cid in enumerate(class_ids)}
+
+        self.build_availability(working_days)
+
+        # Flatten the teacher-subject map into parallel arrays, collecting entries that reference unknown ids
+        unknown = []
+        t_idx, c_idx, demand = [], [], []
+        class_lectures = {cid: [] for cid in class_ids}  # one teacher hard mask per lecture
+        for (teacher_id, class_id, subject_id), can_teach in self.teacher_subject_map.items():
+            if not can_teach or subject_id not in self.subjects:
+                continue
+            if teacher_id not in teacher_index or class_id not in class_index:
+                unknown.append((teacher_id, class_id, subject_id))
+                continue
+            t_idx.append(teacher_index[teacher_id])
+            c_idx.append(class_index[class_id])
+            demand.append(int(self.subjects[subject_id]['weekly_lectures']))
+            class_lectures[class_id].extend([self.availability[teacher_id][0]] * demand[-1])
+
+        t_idx = np.array(t_idx, dtype=np.intp)
+        c_idx = np.array(c_idx, dtype=np.intp)
+        demand = np.array(demand, dtype=np.int64)
+
+        teacher_demand = np.bincount(t_idx, weights=demand, minlength=len(teacher_ids)).astype(np.int64)
+        class_demand = np.bincount(c_idx, weights=demand, minlength=len(class_ids)).astype(np.int64)
+        max_lectures = np.array([int(self.teachers[tid]['max_lectures_per_week']) for tid in teacher_ids], dtype=np.int64)
+        teacher_slots = np.array([bin(self.availability[tid][0]).count('1') for tid in teacher_ids], dtype=np.int64)
+        teacher_capacity = np.minimum(max_lectures, teacher_slots)
+
+        # Name the tighter of the two limits as the constraint a teacher breaks
+        overcommitted_teachers = [
+            {
+                'teacher': teacher_ids[i],
+                'name': self.teachers[teacher_ids[i]]['name'],
+                'demand': int(teacher_demand[i]),
+                'max_lectures_per_week': int(max_lectures[i]),
+                'available_slots': int(teacher_slots[i]),
+                'constraint': 'max_lectures_per_week' if max_lectures[i] <= teacher_slots[i] else 'available_slots'
+            }
+            for i in np.flatnonzero(teacher_demand > teacher_capacity)
+        ]
+        overcommitted_classes = [
+            {
+                'class': class_ids[i],
+                'name': self.classes[class_ids[i]]['name'],
+                'demand': int(class_demand[i]),
+                'available_slots': slots_per_week,
+                'constraint': 'slots_per_week'
+            }
+            for i in np.flatnonzero(class_demand > slots_per_week)
+        ]
+
+        # Within a class every lecture needs its own slot, and only slots its teacher can take.
+        # Classes whose maximum lecture-to-slot matching falls short can never be completed.
+        short = {entry['class'] for entry in overcommitted_classes}
+        for class_id in class_ids:
+            if class_id in short:
+                continue
+            schedulable = self.max_slot_matching(class_lectures[class_id])
+            if schedulable < len(class_lectures[class_id]):
+                overcommitted_classes.append({
+                    'class': class_id,
+                    'name': self.classes[class_id]['name'],
+                    'demand': len(class_lectures[class_id]),
+                    'available_slots': schedulable,
+                    'constraint': 'teacher_availability'
+                })
+
+        # One headline per violated constraint, e.g. "3 teachers over their weekly lecture limit"
+        counts = {}
+        for entry in overcommitted_teachers + overcommitted_classes:
+            counts[entry['constraint']] = counts.get(entry['constraint'], 0) + 1
+        problems = [
+            f"{counts[constraint]} {label}"
+            for constraint, label in [
+                ('max_lectures_per_week', 'teacher(s) over their weekly lecture limit'),
+                ('available_slots', 'teacher(s) with fewer available slots than lectures'),
+                ('slots_per_week', 'class(es) with more lectures than periods in the week'),
+                ('teacher_availability', "class(es) whose teachers' available slots cannot fit all lectures"),
+            ]
+            if counts.get(constraint)
+        ]
+        if unknown:
+            problems.append(f"{len(unknown)} mapping(s) to an unknown teacher or class")
+
+        return {
+            'feasible': not problems,
+            'summary': '; '.join(problems),
+            'slots_per_week': slots_per_week,
+            'total_lectures': int(demand.sum()),
+            'overcommitted_teachers': overcommitted_teachers,
+            'overcommitted_classes': overcommitted_classes,
+            'unknown_mappings': unknown,
+            'elapsed_ms': (time.perf_counter() - started) * 1000
+        }
+
+    def max_slot_matching(self, masks):
+        """Size of a maximum matching of lectures (allowed-slot bitmasks) to distinct slots"""
+        owner = {}  # slot bit -> index of the lecture holding it
+
+        def augment(i, seen):
+            free = masks[i] & ~seen[0]
+            while free:
+                bit = free & -free
+                free ^= bit
+                seen[0] |= bit
+                if bit not in owner or augment(owner[bit], seen):
+                    owner[bit] = i
+                    return True
+            return False
+
+        # Most constrained lectures first keeps the augmenting paths short
+        order = sorted(range(len(masks)), key=lambda i: bin(masks[i]).count('1'))
+        return sum(1 for i in order if augment(i, [0]))
+
+    def schedule_lectures(self):
+        """Schedule lectures using a simple greedy algorithm with constraints"""
+        # Create subject-teacher assignments
+        assignments = []
+        skipped = 0
+        for (teacher_id, class_id, subject_id), can_teach in self.teacher_subject_map.items():
+            if can_teach and subject_id in self.subjects:
+                lectures_needed = int(self.subjects[subject_id]['weekly_lectures'])
+                # Entries check_feasibility reports as unknown mappings can never be placed
+                if teacher_id not in self.teachers or class_id not in self.classes:
+                    skipped += lectures_needed
+                    continue
+                for _ in range(lectures_needed):
+                    assignments.append({
+                        'teacher': teacher_id,
+                        'class': class_id,
+                        'subject': subject_id,
+                        'subject_name': self.subjects[subject_id]['name']
+                    })
+        
+        # Track teacher and class schedules as bitmasks over the day x period grid
+        lecture_slots = [slot for slot in self.time_slots if slot['type'] == 'lecture']
+        self.build_availability(self.working_days)
+        teacher_busy = {tid: 0 for tid in self.teachers}
+        class_busy = {cid: 0 for cid in self.classes}
+        teacher_load = {tid: 0 for tid in self.teachers}
+        
+        # Shuffle assignments for randomization
+        random.shuffle(assignments)
+        
+        # Schedule each assignment
+        scheduled = []
+        for assignment in assignments:
+            teacher_id = assignment['teacher']
+            class_id = assignment['class']
+            hard, soft = self.availability[teacher_id]
+            
+            # Never go past the teacher's weekly limit
+            if teacher_load[teacher_id] >= int(self.teachers[teacher_id]['max_lectures_per_week']):
+                continue
+            
+            # Only slots free for both teacher and class and allowed by the teacher's availability
+            candidates = hard & ~teacher_busy[teacher_id] & ~class_busy[class_id]
+            if not candidates:
+                continue
+            
+            # Take the earliest preferred slot, falling back to the earliest allowed one
+            preferred = candidates & soft
+            chosen = preferred if preferred else candidates
+            bit = (chosen & -chosen).bit_length() - 1
+            day = self.working_days[bit // len(lecture_slots)]
+            slot_data = lecture_slots[bit % len(lecture_slots)]
+            
+            # Assign the slot
+            self.timetable[class_id][day][slot_data['slot']] = {
+                'subject': assignment['subject_name'],
+                'teacher': self.teachers[teacher_id]['name'],
+                'time': f"{slot_data['start_time']}-{slot_data['end_time']}"
+            }
+            
+            # Update schedules
+            teacher_busy[teacher_id] |= 1 << bit
+            class_busy[class_id] |= 1 << bit
+            teacher_load[teacher_id] += 1
+            scheduled.append(assignment)
+        
+        # Report unscheduled assignments
+        unscheduled = len(assignments) - len(scheduled) + skipped
+        self.unscheduled = unscheduled
+        if unscheduled > 0:
+            self.logger.warning(f"⚠️ {unscheduled} lectures could not be scheduled due to constraints")
+
+    def build_availability(self, working_days):
+        """Precompute hard and soft availability bitmasks for every teacher"""
+        lecture_slots = [slot for slot in self.time_slots if slot['type'] == 'lecture']
+        key = (
+            tuple(working_days),
+            tuple((slot['slot'], slot['start_time']) for slot in lecture_slots),
+            tuple((tid, teacher.get('preferred_slots')) for tid, teacher in self.teachers.items())
+        )
+        if key == self.availability_key:
+            return self.availability
+
+        self.availability = {}
+        self.availability_key = key
+        for teacher_id, teacher in self.teachers.items():
+            hard, soft, problems = self.parse_availability(teacher.get('preferred_slots'), lecture_slots, working_days)
+            if not hard:
+                problems.append("no available slots left")
+            if problems:
+                self.logger.warning(f"Availability for {teacher['name']}: {'; '.join(problems)}")
+            self.availability[teacher_id] = (hard, soft)
+        return self.availability
+
+    def parse_availability(self, expression, lecture_slots, working_days):
+        """Parse a Preferred_Slots expression into (hard, soft, problems)
+
+        Clauses are separated by ',' or ';' and each one selects days and periods,
+        e.g. "Mon-Wed P1-P4", "Monday to Wednesday", "Mornings" or "Fri Afternoon".
+        A clause starting with "Not"/"No"/"Except" blocks its slots, and one starting
+        with "Prefer" is a soft preference rather than a hard limit. Bit
+        day_index * periods + period_index stands for that period on that day.
+        Clauses with unrecognised words are ignored; they and selectors that match
+        nothing this week are described in problems.
+        """
+        periods = len(lecture_slots)
+        everything = (1 << (periods * len(working_days))) - 1
+        week = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+        def day_number(word):
+            # Abbreviations and plurals of a day name, but not other words that share its start
+            word = word[:-1] if word.endswith('s') else word
+            return next((i for i, name in enumerate(week) if len(word) >= 3 and name.startswith(word)), None)
+
+        day_numbers = [day_number(day.lower()) for day in working_days]
+        parts_of_day = {'morning': ('00:00', '12:00'), 'afternoon': ('12:00', '17:00'), 'evening': ('17:00', '24:00')}
+
+        allowed = blocked = preferred = 0
+        has_allowed = has_preferred = False
+        problems = []
+
+        for clause in re.split(r'[,;]', str(expression or 'Any')):
+            # "Monday to Wednesday" and "P1 - P4" become single range words
+            words = re.sub(r'\s*(?:\bto\b|-)\s*', '-', clause.strip().lower()).split()
+            if not words or words == ['no', 'preference']:
+                continue
+            kind = 'allow'
+            if words[0] in ('not', 'no', 'except', 'blocked', 'unavailable'):
+                kind = 'block'
+                keyword = words[0]
+                words = words[1:]
+            elif words[0] in ('prefer', 'prefers', 'preferred'):
+                kind = 'prefer'
+                words = words[1:]
+
+            if kind == 'block' and not words:
+                problems.append(f"'{keyword}' on its own does not say what to block")
+                continue
+
+            # None means the clause did not restrict that axis
+            day_set = None
+            period_set = None
+            unknown = []
+            for word in words:
+                range_match = re.fullmatch(r'([a-z]+)(?:-([a-z]+))?', word)
+                period_match = re.fullmatch(r'p(\d+)(?:-p?(\d+))?', word)
+                part = word[:-1] if word.endswith('s') else word
+                if word == 'any':
+                    continue
+                elif period_match:
+                    first = int(period_match.group(1))
+                    last = int(period_match.group(2) or first)
+                    selected = {i for i, slot in enumerate(lecture_slots) if first <= int(slot['slot'][1:]) <= last}
+                    period_set = (period_set or set()) | selected
+                elif part in parts_of_day:
+                    start, end = parts_of_day[part]
+                    selected = {i for i, slot in enumerate(lecture_slots) if start <= slot['start_time'] < end}
+                    period_set = (period_set or set()) | selected
+                elif (range_match and day_number(range_match.group(1)) is not None
+                      and day_number(range_match.group(2) or range_match.group(1)) is not None
+                      and day_number(range_match.group(1)) <= day_number(range_match.group(2) or range_match.group(1))):
+                    first = day_number(range_match.group(1))
+                    last = day_number(range_match.group(2) or range_match.group(1))
+                    selected = {i for i, number in enumerate(day_numbers) if number is not None and first <= number <= last}
+                    day_set = (day_set or set()) | selected
+                else:
+                    unknown.append(word)
+                    continue
+                if not selected:
+                    problems.append(f"'{word}' matches nothing in this week")
+
+            # Skip clauses we only half understand rather than guess, e.g. "Mon after lunch"
+            if unknown:
+                problems.append(f"ignored '{clause.strip()}' (unrecognised: {', '.join(unknown)})")
+                continue
+
+            days = range(len(working_days)) if day_set is None else day_set
+            slots = range(periods) if period_set is None else period_set
+            mask = 0
+            for d in days:
+                for p in slots:
+                    mask |= 1 << (d * periods + p)
+
+            if kind == 'block':
+                blocked |= mask
+            elif kind == 'prefer':
+                preferred |= mask
+                has_preferred = True
+            else:
+                allowed |= mask
+                has_allowed = True
+
+        hard = (allowed if has_allowed else everything) & ~blocked
+        soft = (preferred if has_preferred else everything) & hard
+        return hard, soft, problems
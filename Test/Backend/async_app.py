@@ -0,0 +1,154 @@
+"""Async version of the timetable API, served by an ASGI server.
+
+Exposes the same routes as app.py. Database calls and PDF/DOCX rendering
+run on separate bounded thread pools, so the event loop only awaits them and
+a burst of exports cannot take every database thread. Rendering is CPU-bound
+Python, though: hypercorn workers are daemonic and cannot start child
+processes, so the render threads share the GIL with the event loop and slow
+down other requests in the same worker while they run. Parallelism across
+cores comes only from running several server workers, e.g.:
+
+    hypercorn async_app:app --workers 4 --bind 127.0.0.1:5000 --keep-alive 60
+
+Pool sizes are read from TIMETABLE_DB_WORKERS and TIMETABLE_RENDER_WORKERS.
+Each worker keeps the latest rendered export per file type, keyed by a
+digest of the schedule rows, so repeated downloads of an unchanged schedule
+skip rendering.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from quart import Quart, jsonify, request, send_file
+from quart_cors import cors
+
+import services
+
+DB_WORKERS = int(os.environ.get('TIMETABLE_DB_WORKERS', 8))
+RENDER_WORKERS = int(os.environ.get('TIMETABLE_RENDER_WORKERS', 2))
+
+app = cors(Quart(__name__))
+
+# Created per server worker on startup, not at import time, so forked workers get their own pools.
+# Rendering uses threads rather than processes because hypercorn workers are daemonic and
+# cannot start child processes.
+db_pool = None
+render_pool = None
+
+# (file_type, schedule digest) -> future of the rendered bytes; concurrent requests share one render
+render_cache = {}
+
+
+@app.before_serving
+async def start_pools():
+    global db_pool, render_pool
+    db_pool = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='timetable-db')
+    render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='timetable-render')
+
+
+@app.after_serving
+async def stop_pools():
+    db_pool.shutdown(wait=True)
+    render_pool.shutdown(wait=True)
+
+
+async def run_db(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(db_pool, func, *args)
+
+
+async def run_render(columns, rows, digest, file_type):
+    key = (file_type, digest)
+    future = render_cache.get(key)
+    if future is None:
+        # CSV is cheap, so only PDF/DOCX count against the render pool
+        pool = db_pool if file_type == 'csv' else render_pool
+        future = asyncio.get_running_loop().run_in_executor(
+            pool, services.render_timetable, columns, rows, file_type)
+        # Only the current schedule is worth keeping
+        for stale in [k for k in render_cache if k[0] == file_type]:
+            del render_cache[stale]
+        render_cache[key] = future
+    try:
+        # Shield so one client disconnecting does not cancel the render for everyone else
+        return await asyncio.shield(future)
+    except Exception:
+        if render_cache.get(key) is future:
+            del render_cache[key]
+        raise
+
+
+# Truncate and upload new teacher data
+@app.route('/upload', methods=['POST'])
+async def upload_teacher_data():
+    file = (await request.files).get('file')
+    if not file:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    try:
+        if await run_db(services.upload_teacher_data, BytesIO(file.read())):
+            return jsonify({"message": "Data uploaded successfully!"})
+        else:
+            return jsonify({"error": "Failed to connect to database"}), 500
+    except Exception as e:
+        print(f"Error: {e}")
+        return jsonify({"error": "Failed to process file"}), 500
+
+@app.route('/generate', methods=['POST'])
+async def generate_timetable():
+    try:
+        if not await run_db(services.generate_schedule):
+            return jsonify({"error": "Failed to connect to database"}), 500
+
+        return jsonify({"message": "Schedule generated successfully!"})
+    except Exception as e:
+        print(f"Error: {e}")
+        return jsonify({"error": "Failed to generate schedule"}), 500
+
+
+# Serve dropdown options for Department, Class, Teacher
+@app.route('/dropdown/department', methods=['GET'])
+async def get_department_dropdown():
+    return await get_dropdown_options('Department')
+
+@app.route('/dropdown/class', methods=['GET'])
+async def get_class_dropdown():
+    return await get_dropdown_options('Class')
+
+@app.route('/dropdown/teacher', methods=['GET'])
+async def get_teacher_dropdown():
+    return await get_dropdown_options('Teacher')
+
+# Generalized function to fetch distinct values
+async def get_dropdown_options(field):
+    try:
+        options = await run_db(services.fetch_dropdown_options, field)
+        if options is None:
+            return jsonify({"error": "Failed to connect to database"}), 500
+        return jsonify({"options": options})
+    except Exception as e:
+        print(f"Error: {e}")
+        return jsonify({"error": "Failed to fetch dropdown data"}), 500
+
+# Download timetable in table format (CSV, PDF, DOCX)
+@app.route('/download', methods=['GET'])
+async def download_timetable():
+    file_type = request.args.get('type', 'csv').lower()  # Ensure the type is lowercase
+    if file_type not in services.MIMETYPES:
+        return jsonify({"error": "Invalid file type"}), 400
+    try:
+        # Fetch timetable from database
+        result = await run_db(services.fetch_schedule)
+        if result is None:
+            return jsonify({"error": "Failed to connect to database"}), 500
+
+        columns, rows, digest = result
+        output = BytesIO(await run_render(columns, rows, digest, file_type))
+        return await send_file(output, as_attachment=True, attachment_filename=f"timetable.{file_type}",
+                               mimetype=services.MIMETYPES[file_type])
+    except Exception as e:
+        print(f"Error: {e}")
+        return jsonify({"error": "Failed to download timetable"}), 500
+
+if __name__ == '__main__':
+    app.run(debug=True)
@@ -0,0 +1,153 @@
+"""Load test for the timetable API against a local SQLite stand-in.
+
+Seeds a SQLite database shaped like the SQL Server one, optionally starts
+async_app under hypercorn pointed at it, then fires concurrent dropdown and
+download requests and reports status counts and latencies.
+
+    python load_test.py --spawn --requests 1000 --concurrency 300
+    python load_test.py --url http://127.0.0.1:5000 --skip-seed
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+import services
+
+ENDPOINTS = [
+    "/dropdown/department",
+    "/dropdown/class",
+    "/dropdown/teacher",
+    "/download?type=csv",
+    "/download?type=pdf",
+    "/download?type=docx",
+]
+
+
+def seed_database(path, teachers=40):
+    """Create teacher_data and schedule tables and fill them with generated rows."""
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE teacher_data (ID INTEGER, Teacher TEXT, Subjects TEXT, Class TEXT,
+                                   Department TEXT, Lecture TEXT, Practical TEXT)
+    """)
+    cursor.execute("""
+        CREATE TABLE schedule (Teacher TEXT, Subjects TEXT, Class TEXT, Department TEXT,
+                               D_name TEXT, Time_Slot TEXT, Lecture TEXT, Practical TEXT)
+    """)
+    departments = ["CS", "IT", "BMS", "BAF"]
+    classes = ["FY", "SY", "TY"]
+    rows = [
+        (i + 1, f"Prof. {i + 1}", f"Subject {i + 1}", random.choice(classes),
+         random.choice(departments), "Yes", "No")
+        for i in range(teachers)
+    ]
+    cursor.executemany("INSERT INTO teacher_data VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.commit()
+    connection.close()
+
+    # Build the schedule the same way the /generate route does
+    services.SQLITE_PATH = path
+    services.generate_schedule()
+
+
+def wait_for_server(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url + "/dropdown/class", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up within {timeout}s")
+
+
+async def run_load(url, total, concurrency):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = {endpoint: [] for endpoint in ENDPOINTS}
+    statuses = Counter()
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        async def one(endpoint):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(endpoint)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies[endpoint].append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(ENDPOINTS[i % len(ENDPOINTS)]) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def report(latencies, statuses, elapsed, total):
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    print("Status codes:", dict(statuses))
+    for endpoint, samples in latencies.items():
+        if not samples:
+            continue
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"  {endpoint:<24} n={len(samples):<5} median={statistics.median(samples) * 1000:7.1f}ms "
+              f"p95={p95 * 1000:7.1f}ms max={samples[-1] * 1000:7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "standin.db"),
+                        help="SQLite stand-in database path (default: next to this script)")
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4, help="hypercorn workers when using --spawn")
+    parser.add_argument("--spawn", action="store_true", help="start async_app under hypercorn")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db)
+    if not args.skip_seed:
+        seed_database(db_path)
+
+    server = None
+    if args.spawn:
+        bind = args.url.split("://", 1)[-1]
+        env = dict(os.environ, TIMETABLE_SQLITE=db_path)
+        # Requests can wait longer than hypercorn's 5s default keep-alive for a semaphore slot,
+        # after which the client would reuse a connection the server already closed
+        server = subprocess.Popen(
+            [sys.executable, "-m", "hypercorn", "async_app:app", "--workers", str(args.workers), "--bind", bind,
+             "--keep-alive", "60", "--backlog", str(max(100, args.concurrency))],
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        )
+    try:
+        wait_for_server(args.url)
+        latencies, statuses, elapsed = asyncio.run(run_load(args.url, args.requests, args.concurrency))
+        report(latencies, statuses, elapsed, args.requests)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    failures = sum(count for status, count in statuses.items() if status != 200)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
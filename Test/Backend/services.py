@@ -0,0 +1,239 @@
+"""Blocking database and export helpers shared by the Flask and async apps.
+
+Everything in here is plain synchronous code. The Flask app calls it
+directly, and the async app runs it on bounded worker pools.
+"""
+import hashlib
+import os
+import sqlite3
+from io import BytesIO
+
+import pandas as pd
+
+try:
+    import pyodbc
+except ImportError:  # Only needed for the SQL Server backend
+    pyodbc = None
+
+# Set TIMETABLE_SQLITE to a file path to use a local SQLite database instead of SQL Server
+SQLITE_PATH = os.environ.get('TIMETABLE_SQLITE')
+
+DROPDOWN_FIELDS = ('Department', 'Class', 'Teacher')
+
+TIME_SLOTS = [
+    "9:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-1:00",
+    "1:15-2:15", "2:15-3:15", "3:15-4:15"
+]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+MIMETYPES = {
+    'csv': "text/csv",
+    'pdf': "application/pdf",
+    'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+# Database connection
+def get_db_connection():
+    if SQLITE_PATH:
+        return sqlite3.connect(SQLITE_PATH)
+    if pyodbc is None:
+        print("Error connecting to database: pyodbc is not installed")
+        return None
+    try:
+        connection = pyodbc.connect(
+            r'DRIVER={ODBC Driver 17 for SQL Server};'
+            r'SERVER=LAPTOP-38HJSU5G\SQLEXPRESS;'
+            r'DATABASE=college;'
+            r'Trusted_Connection=yes;'
+        )
+        return connection
+    except pyodbc.Error as e:
+        print(f"Error connecting to database: {e}")
+        return None
+
+
+def clear_table(cursor, table):
+    # SQLite has no TRUNCATE
+    if SQLITE_PATH:
+        cursor.execute(f"DELETE FROM {table}")
+    else:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+
+
+def upload_teacher_data(file):
+    """Replace teacher_data with the rows of an Excel file. Returns False if the database is unreachable."""
+    df = pd.read_excel(file)  # Read the Excel file into a DataFrame
+    connection = get_db_connection()
+    if not connection:
+        return False
+
+    cursor = connection.cursor()
+    clear_table(cursor, "teacher_data")  # Clear the existing table
+    connection.commit()
+
+    for _, row in df.iterrows():
+        cursor.execute("""
+            INSERT INTO teacher_data (ID, Teacher, Subjects, Class, Department, Lecture, Practical)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (row['ID'], row['Teacher'], row['Subjects'], row['Class'], row['Department'], row['Lecture'], row['Practical']))
+
+    connection.commit()
+    connection.close()
+    return True
+
+
+def generate_schedule():
+    """Rebuild the schedule table from teacher_data. Returns False if the database is unreachable."""
+    connection = get_db_connection()
+    if not connection:
+        return False
+
+    cursor = connection.cursor()
+
+    # Fetch all teachers and their subjects
+    cursor.execute("SELECT Teacher, Subjects FROM teacher_data")
+    teachers = cursor.fetchall()
+
+    # Fetch all unique class and department combinations
+    cursor.execute("SELECT DISTINCT Class, Department FROM teacher_data")
+    classes_departments = cursor.fetchall()
+
+    # Initialize tracking structures
+    occupied_slots = {}  # Tracks time slots already assigned to each teacher
+    schedule = []        # Final schedule to be inserted into the database
+
+    for class_name, department in classes_departments:
+        for day in DAYS:
+            # Reset daily load for each day
+            daily_load = {teacher_name: {"lecture": 0, "practical": 0} for teacher_name, _ in teachers}
+
+            for time in TIME_SLOTS:
+                for teacher_name, subjects in teachers:
+                    time_slot = f"{day} {time}"
+
+                    # Check if the teacher is already occupied in this time slot
+                    if time_slot in occupied_slots.get(teacher_name, set()):
+                        continue
+
+                    # Assign lectures and practicals if limits are not exceeded
+                    if teacher_name not in occupied_slots:
+                        occupied_slots[teacher_name] = set()
+
+                    if daily_load[teacher_name]["lecture"] < 2:
+                        # Schedule a lecture
+                        lecture, practical = "Yes", "No"
+                        daily_load[teacher_name]["lecture"] += 1
+                    elif daily_load[teacher_name]["practical"] < 1:
+                        # Schedule a practical
+                        lecture, practical = "No", "Yes"
+                        daily_load[teacher_name]["practical"] += 1
+                    else:
+                        continue
+
+                    schedule.append((teacher_name, subjects, class_name, department, day, time, lecture, practical))
+                    occupied_slots[teacher_name].add(time_slot)
+
+    # Insert the updated schedule into the database
+    clear_table(cursor, "schedule")
+    cursor.executemany("""
+        INSERT INTO schedule (Teacher, Subjects, Class, Department, D_name, Time_Slot, Lecture, Practical)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, schedule)
+
+    connection.commit()
+    connection.close()
+    return True
+
+
+def fetch_dropdown_options(field):
+    """Distinct values of a teacher_data column, or None if the database is unreachable."""
+    if field not in DROPDOWN_FIELDS:
+        raise ValueError(f"Unknown dropdown field: {field}")
+    connection = get_db_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT DISTINCT {field} FROM teacher_data ORDER BY {field} ASC")
+    options = [row[0] for row in cursor.fetchall()]
+    connection.close()
+    return options
+
+
+def fetch_schedule():
+    """Return (columns, rows, digest) of the schedule table, or None if the database is unreachable.
+
+    The digest identifies the schedule contents so rendered exports can be cached.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT * FROM schedule")
+    columns = [description[0] for description in cursor.description]
+    rows = [list(row) for row in cursor.fetchall()]
+    connection.close()
+    digest = hashlib.sha1(repr((columns, rows)).encode()).hexdigest()
+    return columns, rows, digest
+
+
+def render_timetable(columns, rows, file_type):
+    """Render the schedule as CSV, PDF or DOCX bytes.
+
+    Takes plain lists rather than a DataFrame so callers can hand it data from any
+    worker without sharing a pandas object.
+    """
+    output = BytesIO()
+
+    # For CSV download
+    if file_type == 'csv':
+        pd.DataFrame(rows, columns=columns).to_csv(output, index=False)
+
+    # For PDF download
+    elif file_type == 'pdf':
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+        from reportlab.lib import colors
+
+        doc = SimpleDocTemplate(output, pagesize=letter)
+
+        # Header row followed by the table rows
+        table = Table([columns] + rows)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.whitesmoke)
+        ]))
+        doc.build([table])
+
+    # For Word document download
+    elif file_type == 'docx':
+        from docx import Document
+
+        doc = Document()
+        doc.add_heading('Timetable', 0)
+
+        # Add table and header
+        table = doc.add_table(rows=1, cols=len(columns))
+        table.style = 'Table Grid'
+        hdr_cells = table.rows[0].cells
+        for i, column_name in enumerate(columns):
+            hdr_cells[i].text = column_name
+
+        for row in rows:
+            row_cells = table.add_row().cells
+            for i, value in enumerate(row):
+                row_cells[i].text = str(value)
+
+        doc.save(output)
+
+    else:
+        raise ValueError(f"Invalid file type: {file_type}")
+
+    return output.getvalue()